@@ -1,7 +1,7 @@
 # **********************************************************************************
 # This defines  a hirarchical data storage class called datacube.                 *
-# A datacube stores a 2-dimensional table of values of the same types:            *
-#       array len(self._table[self._index,:])).                                   *
+# A datacube stores a 2-dimensional table of values of the same types,            *
+# held column by column as 1-dimensional arrays (one per field name).             *
 # Each datacube is identified by a name and has other properties.                 *
 # A datacube can have one or more "children datacubes" for each row of its table, *
 # thus creating a multidimensional data model.                                    *
@@ -11,27 +11,27 @@
 # Imports and utility classes
 #*******************************************************************************
 
-import sys
-import yaml
 import string
-import StringIO
 import os
 import os.path
-import pickle
-import copy
 import time
-import weakref
 import re
 
-from ctypes import *
-from numpy import *
-from scipy import *
+from collections import deque, OrderedDict
+from contextlib import contextmanager
+
+# explicit numpy imports keep the module dict small (faster LOAD_GLOBAL in the hot methods);
+# yaml and pickle are imported locally by the save/load methods that need them
+from numpy import (arange, array, ascontiguousarray, column_stack, empty, full, ones, zeros, isclose, flatnonzero,
+                   int_, intc, intp, int8, int16, int32, int64,
+                   uint8, uint16, uint32, uint64,
+                   float_, float16, float32, float64,
+                   complex_, complex64, complex128)
 
 from pyview.lib.classes import *
 
 from pyview.helpers.datamanager import DataManager   # DATAMANAGER
 from pyview.lib.patterns import Subject, Observer, Reloadable
-from pyview.lib.classes import *
 
 
 class ChildItem:
@@ -51,6 +51,164 @@ class ChildItem:
     def attributes(self):
         return self._attributes
 
+    def rebind(self, datacube, attributes):
+        """
+        Reinitializes a pooled item with a new datacube and attributes dictionary.
+        """
+        self._datacube = datacube
+        self._attributes = attributes
+        return self
+
+    def reset(self):
+        """
+        Drops the references of a retired item so it can wait on the pool.
+        """
+        self._datacube = None
+        self._attributes = None
+
+#******************************************************************************
+#  Serialization helpers
+#******************************************************************************
+
+
+def _yamlLoad(source):
+    """
+    Parses yaml with the libyaml C loader when available (much faster than the
+    pure-Python one), falling back to the default loader for legacy documents
+    that contain python object tags.
+    """
+    import yaml
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    try:
+        return yaml.load(source, Loader=loader)
+    except yaml.YAMLError:
+        return yaml.load(source)
+
+
+def _yamlFaithful(obj):
+    """
+    Tells whether the safe dumpers represent a structure without distortion:
+    every dictionary key must be a plain scalar (a non-scalar key is emitted
+    as a yaml complex key that no loader can construct back) and tuples are
+    refused anywhere (the safe loaders return them as lists).
+    """
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            if not isinstance(key, (basestring, int, long, float)) and key is not None:
+                return False
+            if not _yamlFaithful(value):
+                return False
+        return True
+    if isinstance(obj, tuple):
+        return False
+    if isinstance(obj, list):
+        for value in obj:
+            if not _yamlFaithful(value):
+                return False
+        return True
+    return True
+
+
+def _yamlDump(obj):
+    """
+    Dumps yaml with the libyaml C dumper when available, falling back to the
+    default dumper for objects the safe representer refuses or distorts.
+    """
+    import yaml
+    if not _yamlFaithful(obj):
+        # the safe dumpers distort tuples into lists and emit e.g. a tuple key
+        # as a yaml complex key that no loader can construct back; the tagged
+        # default dumper round-trips both
+        return yaml.dump(obj)
+    dumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+    try:
+        return yaml.dump(obj, Dumper=dumper)
+    except yaml.YAMLError:
+        return yaml.dump(obj)
+
+
+def _jsonDefault(obj):
+    """
+    Converts numpy scalars to their Python equivalents for the json encoder.
+    """
+    item = getattr(obj, 'item', None)
+    if item is not None:
+        return item()
+    raise TypeError(repr(obj) + " is not JSON serializable")
+
+
+def _jsonFaithful(obj):
+    """
+    Tells whether a parameter structure can round-trip through json without
+    silent distortion: no dictionary key converted to a string and no tuple
+    coming back as a list.
+    """
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            if not isinstance(key, basestring) or not _jsonFaithful(value):
+                return False
+        return True
+    if isinstance(obj, tuple):
+        return False
+    if isinstance(obj, list):
+        for value in obj:
+            if not _jsonFaithful(value):
+                return False
+        return True
+    return True
+
+
+def _dumpParams(paramsDict):
+    """
+    Serializes a .par dictionary, preferring json (parsed by C code on both
+    ends, see the loader sniffing in loadtxt) and falling back to yaml for
+    content json cannot represent faithfully.
+    """
+    if _jsonFaithful(paramsDict):
+        import json
+        try:
+            return json.dumps(paramsDict, default=_jsonDefault)
+        except (TypeError, ValueError):
+            pass
+    return _yamlDump(paramsDict)
+
+
+def _dtypeName(dataType):
+    """
+    Returns the plain string name of a table dtype so that metadata can be
+    dumped with the safe yaml representers.
+    """
+    if dataType is None or isinstance(dataType, basestring):
+        return dataType
+    return getattr(dataType, '__name__', str(dataType))
+
+
+def _dtypeFromName(name):
+    """
+    Resolves a dtype name written by _dtypeName back to the type object.
+    Values that are not strings (legacy files store the type directly) pass through.
+    """
+    if not isinstance(name, basestring):
+        return name
+    builtins = {'bool': bool, 'int': int, 'float': float, 'complex': complex}
+    if name in builtins:
+        return builtins[name]
+    from numpy import dtype as npdtype
+    return npdtype(name).type
+
+
+def _restoreMetaDtypes(meta):
+    """
+    Converts the dtype names of a deserialized meta dictionary back to types.
+    """
+    if "dataType" in meta:
+        meta["dataType"] = _dtypeFromName(meta["dataType"])
+    fieldDtypes = meta.get("fieldDtypes")
+    if fieldDtypes:
+        meta["fieldDtypes"] = dict([(name, _dtypeFromName(value)) for name, value in fieldDtypes.items()])
+    return meta
+
+
 #******************************************************************************
 #  Datacube class
 #******************************************************************************
@@ -59,7 +217,9 @@ class ChildItem:
 class Datacube(Subject, Observer, Reloadable, Debugger):
     """
     Defines a hirarchical data storage class called datacube.
-    A datacube stores a 2-dimensional table of values of the same type in a numpy array.
+    A datacube stores a 2-dimensional table of values of the same type, kept internally
+    as one contiguous 1-dimensional numpy array per column (structure-of-arrays layout),
+    so that single-column reads and writes touch only that column's memory.
     It may have a parent datacube and one or more "children datacubes" for each row of its table, thus creating a multidimensional data model.
     As a member of the Observer and Subject classes, a datacube can send and receive notifications (messages).
 
@@ -106,6 +266,9 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
 
     defaults = dict()
 
+    # compiled once at import; used by _sanitizeFilename for every saved cube
+    _SANITIZE_RE = re.compile(r'[^\=\_\-\+\w\d\[\]\(\)\s\\\/]')
+
     ######################################
     # creator
     ######################################
@@ -120,6 +283,9 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
         """
         Initializes the data cube.
         """
+        # cached debug flag checked before the hot-path debugPrint calls, so that disabled
+        # debugging costs a single attribute lookup instead of argument formatting + dispatch
+        self._debug = False
         self.debugPrint('Creating datacube ', name, ' = ', self)
         self._meta = dict()
         if defaults is None:
@@ -127,31 +293,78 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
         self._meta["defaults"] = defaults
         self._meta["filename"] = filename
         self._meta["name"] = name
-        self._meta["fieldNames"] = []                 # ordered list of field (column) names
+        # the hottest entries (length, fieldNames, fieldMap, indexToName, dataType) are held as
+        # direct attributes instead of _meta entries, saving a dict lookup with string hashing on
+        # every access in the commit path; _syncMeta/_loadMetaAttrs translate at the file boundary
+        self._fieldNames = []                 # ordered list of field (column) names
         self._meta["description"] = description
-        self._meta["fieldMap"] = dict()               # dictionary of the field names with values equal to their index
+        self._fieldMap = dict()               # dictionary of the field names with values equal to their index
         # can appear as redundant but make easier the access by name and provides
         # a memory on column creation or supression.
+        self._indexToName = dict()            # reverse map of fieldMap
         self._meta["parameters"] = dict()
         self._meta["index"] = 0
         self._meta["tags"] = ""
-        self._meta["length"] = 0
-        self._meta["dataType"] = dtype
+        self._length = 0
+        self._dataType = dtype
+        self._meta["fieldDtypes"] = dict()            # optional per-column dtypes overriding dataType
         self._meta["modificationTime"] = time.time()
         self._meta["creationTime"] = time.time()
 
         self._children = []
+        self._childrenCache = None                    # cached list of children cubes, rebuilt on demand
+        self._childIndex = dict()                     # maps id(childCube) to its ChildItem for O(1) lookups
+        self._childAttrIndex = dict()                 # maps attribute name to {value: set of ChildItems}
+        self._childPool = []                          # retired ChildItems reused by addChild
+        self._parhash = None                          # fingerprint of the last written .par header
         self._parameters = dict()
-        self._table = zeros(0)
+        self._columns = dict()                        # maps each field name to its 1D column array
+        self._capacity = 0                            # allocated rows per column (>= length), grown geometrically
+        self._schemaDirty = False                     # True when fieldNames changed and columns/fieldMap lag behind
+        self._nextNewId = 1                           # next identifier tried by newColumnName
+        self._batchDepth = 0                          # nesting depth of batch() contexts
+        self._pendingNotify = OrderedDict()           # notifications queued while inside a batch() context
         self._parent = None
 
         self.setModified()
 
     def __getitem__(self, keys):
-        if not hasattr(keys, '__iter__'):
-            keys = [keys]
+        if isinstance(keys, basestring):    # a single name goes straight to the 1D column view
+            return self.column(keys)
         return self.columns(keys)
 
+    ###############################
+    # notification management
+    ###############################
+
+    def notify(self, property=None, value=None):
+        """
+        Sends a notification to the observers, or queues it when inside a batch() context.
+        Queued notifications are coalesced by property name, keeping the last value.
+        """
+        if self._batchDepth > 0:
+            self._pendingNotify[property] = value
+        else:
+            Subject.notify(self, property, value)
+
+    @contextmanager
+    def batch(self):
+        """
+        Context manager that suspends notifications for its duration:
+        notifications sent inside a 'with cube.batch():' block are coalesced by property name
+        and delivered once on exit, so bulk operations notify observers O(1) times instead of O(N).
+        Batches can be nested; delivery happens when the outermost batch exits.
+        """
+        self._batchDepth += 1
+        try:
+            yield self
+        finally:
+            self._batchDepth -= 1
+            if self._batchDepth == 0:
+                pending, self._pendingNotify = self._pendingNotify, OrderedDict()
+                for property, value in pending.items():
+                    Subject.notify(self, property, value)
+
     ###############################
     # datacube property management
     ###############################
@@ -167,11 +380,19 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
         Sets the name of the datacube
         """
         self._meta["name"] = str(name)
-        self.debugPrint('datacube.setName with datacube ', self.name(), ' notifying "name with name=', name)
-        self.notify("name", name)
-        self.notify("metaUpdated", self._meta)
+        if self._debug:
+            self.debugPrint('datacube.setName with datacube ', self.name(), ' notifying "name with name=', name)
+        self._notifyMeta("name", name)
         self.setModified()
 
+    def _notifyMeta(self, key, value):
+        """
+        Sends a single notification for a metadata change.
+        Observers interested in all metadata changes subscribe to the specific keys;
+        the redundant generic "metaUpdated" notification is no longer sent.
+        """
+        self.notify(key, value)
+
     def parent(self):
         """
         Returns the parent of the data cube.
@@ -183,10 +404,10 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
         Sets the parent of the data cube to *parent*.
         """
         self._parent = parent
-        self.notify("metaUpdated", self._meta)
+        self._notifyMeta("parent", parent)
 
     def dataType(self):
-        return self._meta["dataType"]
+        return self._dataType
 
     def index(self):
         """
@@ -207,23 +428,24 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
         """
         self._parameters = paramDict
         self.setModified()
-        self.debugPrint('datacube.setParameters with datacube ', self.name(),
-                        ' notifying ""parameters"" with parameters=', paramDict)
-        self.notify("parameters", self._parameters)
-        self.notify("metaUpdated", self._meta)
+        if self._debug:
+            self.debugPrint('datacube.setParameters with datacube ', self.name(),
+                            ' notifying ""parameters"" with parameters=', paramDict)
+        self._notifyMeta("parameters", self._parameters)
 
     def addParameters(self, paramDict):
         """
         Adds the content of a parameter dictionary params to the datacube's parameters dictionary
         Then notify the frontpanel of the new params
         """
-        for key in paramDict.keys():
-            self._parameters[key] = paramDict[key]
-        self.setModified()
-        self.debugPrint('datacube.addParameters with datacube ', self.name(),
-                        ' notifying ""parameters"" with parameters=', paramDict)
-        self.notify("parameters", self._parameters)
-        self.notify("metaUpdated", self._meta)
+        with self.batch():
+            for key in paramDict.keys():
+                self._parameters[key] = paramDict[key]
+            self.setModified()
+            if self._debug:
+                self.debugPrint('datacube.addParameters with datacube ', self.name(),
+                                ' notifying ""parameters"" with parameters=', paramDict)
+            self._notifyMeta("parameters", self._parameters)
 
     def setParameter(self, key, value):
         """
@@ -240,9 +462,9 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
         """
         self._meta["filename"] = os.path.realpath(filename)
         self.setModified()
-        self.debugPrint('datacube.setFilename with datacube=', self, ' notifying ""filename"" with filename=', filename)
-        self.notify("filename", filename)
-        self.notify("metaUpdated", self._meta)
+        if self._debug:
+            self.debugPrint('datacube.setFilename with datacube=', self, ' notifying ""filename"" with filename=', filename)
+        self._notifyMeta("filename", filename)
 
     def relfilename(self):
         """
@@ -274,9 +496,9 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
         """
         self._meta["tags"] = str(tags)
         self.setModified()
-        self.debugPrint('datacube.setTags with datacube ', self.name(), ' notifying ""tags"" with tags=', tags)
-        self.notify("tags", tags)
-        self.notify("metaUpdated", self._meta)
+        if self._debug:
+            self.debugPrint('datacube.setTags with datacube ', self.name(), ' notifying ""tags"" with tags=', tags)
+        self._notifyMeta("tags", tags)
 
     def setDescription(self, description):
         """
@@ -284,16 +506,16 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
         """
         self._meta["description"] = str(description)
         self.setModified()
-        self.debugPrint('datacube.setDescription with datacube ', self.name(),
-                        ' notifying ""description"" with description=', description)
-        self.notify("description", description)
-        self.notify("metaUpdated", self._meta)
+        if self._debug:
+            self.debugPrint('datacube.setDescription with datacube ', self.name(),
+                            ' notifying ""description"" with description=', description)
+        self._notifyMeta("description", description)
 
     def structure(self, tabs=""):
         """
         Returns a string describing the structure of the datacube
         """
-        string = tabs + "cube(%d,%d)" % (self._meta["length"], len(self._meta["fieldNames"])) + "\n"
+        string = tabs + "cube(%d,%d)" % (self._length, len(self._fieldNames)) + "\n"
         for item in self._children:
             child = item.datacube()
             attributes = item.attributes()
@@ -310,7 +532,8 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
         """
         self._meta["modificationTime"] = time.time()
         self._unsaved = True
-        self.debugPrint('modified at time ', self._meta["modificationTime"])
+        if self._debug:
+            self.debugPrint('modified at time ', self._meta["modificationTime"])
 
     def modified(self):
         """
@@ -334,18 +557,15 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
         0 for self only, 1 for self and children, 2 for self, children and grand-children, and so on.
         """
         depth = 0
-        children = self.children()
-        hasChildren = len(children) > 0
-        while hasChildren:
+        children = self._children       # walk the ChildItems directly, without rebuilding cube lists per node
+        while len(children) > 0:
             depth += 1
             newChildrenList = []
-            for child in children:
-                newChildren = child.children()
-                hasChildren = len(newChildren) > 0
-                if not hasChildren:
-                    return depth
-                else:
-                    newChildrenList += newChildren
+            for item in children:
+                newChildren = item.datacube()._children
+                if len(newChildren) == 0:
+                    return depth        # return the first time a branch stops at the current level
+                newChildrenList += newChildren
             children = newChildrenList
         return depth
 
@@ -363,11 +583,17 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
         return tree
 
     def familyMembers(self):
-        def flatten(nested, flat=[]):
-            for i in nested:
-                flatten(i, flat=flat) if isinstance(i, list) else flat.append(i)
-            return flat
-        return flatten(self.tree())
+        """
+        Returns the list of the datacube and all its descendants, in depth-first order.
+        The tree is walked iteratively over _children, without building the nested tree() structure.
+        """
+        members = []
+        stack = deque([self])
+        while stack:
+            cube = stack.pop()
+            members.append(cube)
+            stack.extend(item.datacube() for item in reversed(cube._children))
+        return members
 
     def cubesAtLevel(self, level=0, allBranchesOnly=False, nameOut=False):
         """
@@ -408,23 +634,33 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
         tree_of_children_if_any=[names_of_children_if_any,tree_of_grandchildren_if_any], and so on.
         """
         names = list(
-            self._meta["fieldNames"])  # Very important: clone the list _meta["fieldNames"] to protect it from modification outside
+            self._fieldNames)  # Very important: clone the list _meta["fieldNames"] to protect it from modification outside
         if not includeChildren:
             return names
+        if upToLevel < 0:
+            upToLevel = max(0, self.maxDepth() + 1 + upToLevel)
+        if flatten:
+            # iterative walk with a single ordered dedup pass, instead of per-level set unions
+            # (which allocated intermediate sets at every level and discarded the discovery order)
+            seen = set(names)
+            stack = [(child, 1) for child in reversed(self.children())]
+            while stack:
+                cube, level = stack.pop()
+                if level > upToLevel:
+                    continue
+                for name in cube._fieldNames:
+                    if name not in seen:
+                        seen.add(name)
+                        names.append(name)
+                stack.extend([(grandChild, level + 1) for grandChild in reversed(cube.children())])
+            return names
         else:
-            if upToLevel < 0:
-                upToLevel = max(0, self.depth() + 1 + upToLevel)
             if upToLevel == 0 or not self.children():
                 new = []
             else:
-                upToLevel -= 1
-                new = [child.names(includeChildren=includeChildren, upToLevel=upToLevel, flatten=flatten)
+                new = [child.names(includeChildren=includeChildren, upToLevel=upToLevel - 1, flatten=flatten)
                        for child in self.children()]
-            if flatten:
-                new = list(set().union(*map(set, new)))
-                return names + new
-            else:
-                return [names, new]
+            return [names, new]
 
     def commonNames(self):
         """
@@ -437,12 +673,10 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
         hasChildren = len(children) > 0
         while hasChildren:              # loop while there are still children everywhere at the next level
             newChildrenList = []
-            #newCommonNames = set(children[0].names())
-            newCommonNames = children[0].names()  # modified august 2016 for keeping the order
+            # order of the first child is kept; sets only provide O(1) membership for the intersections
+            newCommonNames = list(children[0]._fieldNames)
             for child in children:
-                newNames = child.names()
-                # newCommonNames.intersection_update(newNames)
-                # modified august 2016 for keeping the order
+                newNames = set(child._fieldNames)
                 newCommonNames = [name for name in newCommonNames if name in newNames]
                 if not newCommonNames:
                     commonNames.append([])    # MODIFIED DV JAN 2015
@@ -466,21 +700,67 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
 
     def table(self):
         """
-        Returns the validated part of the data table, i.e., from index 0 to length-1
+        Returns the validated part of the data table, i.e., from index 0 to length-1.
+        The columns being stored separately, the returned 2D array is built by stacking them (and is thus a copy).
         """
-        return self._table[:self._meta["length"], :]
+        length = self._length
+        fieldNames = self._fieldNames
+        if not fieldNames:
+            return zeros((length, 0), dtype=self._dataType)
+        return column_stack([self._columns[name][:length] for name in fieldNames])
 
     def updateFieldMap(self):
-        self.debugPrint('In ', self._meta["name"], '.updateFieldMap()')
-        self._meta["fieldMap"] = dict()
-        for i in range(len(self._meta["fieldNames"])):
-            self._meta["fieldMap"][self._meta["fieldNames"][i]] = i
+        if self._debug:
+            self.debugPrint('In ', self._meta["name"], '.updateFieldMap()')
+        fieldNames = self._fieldNames
+        self._fieldMap = dict([(name, i) for i, name in enumerate(fieldNames)])
+        # reverse map kept alongside fieldMap so that columnName is an O(1) lookup
+        self._indexToName = dict([(i, name) for i, name in enumerate(fieldNames)])
+
+    def _syncMeta(self):
+        """
+        Copies the mirrored hot attributes back into the _meta dictionary, which remains
+        the serialization view of the datacube. Call before dumping _meta to a file.
+        """
+        meta = self._meta
+        meta["length"] = self._length
+        meta["fieldNames"] = self._fieldNames
+        meta["fieldMap"] = self._fieldMap
+        # indexToName is derived data rebuilt by updateFieldMap on load; its integer
+        # keys would also force every .par sidecar onto the yaml fallback (json
+        # cannot keep non-string keys), so it is not serialized
+        meta.pop("indexToName", None)
+        meta["dataType"] = self._dataType
+
+    def _serializableMeta(self):
+        """
+        Returns a copy of _meta with the dtype entries replaced by their string
+        names, suitable for the safe yaml (or json) representers.
+        Call _syncMeta first so the copy is up to date.
+        """
+        meta = dict(self._meta)
+        meta["dataType"] = _dtypeName(meta.get("dataType"))
+        fieldDtypes = meta.get("fieldDtypes")
+        if fieldDtypes:
+            meta["fieldDtypes"] = dict([(name, _dtypeName(value)) for name, value in fieldDtypes.items()])
+        return meta
+
+    def _loadMetaAttrs(self):
+        """
+        Mirrors the hot _meta entries as direct attributes after _meta has been replaced by a load.
+        Missing entries keep their current values; the maps are rebuilt from the field names.
+        """
+        meta = self._meta
+        self._length = meta.get("length", self._length)
+        self._fieldNames = meta.get("fieldNames", self._fieldNames)
+        self._dataType = meta.get("dataType", self._dataType)
+        self.updateFieldMap()
 
     def __len__(self):  # magic method
         """
         Returns the length of the datacube, i.e., the number of rows (up to the last validated one)
         """
-        return self._meta["length"]
+        return self._length
 
     ############################
     # Table reshaping
@@ -488,51 +768,58 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
 
     def _resize(self, size):
         """
-        Resizes the datacube table
+        Resizes every column of the datacube table to a given number of rows
         """
-        self._table.resize(size, refcheck=False)  # size is a tuple (nbrRows,nbrColumns)
+        nbrRows = size[0] if isinstance(size, tuple) else size
+        for column in self._columns.values():
+            column.resize(nbrRows, refcheck=False)
+        self._capacity = nbrRows
 
     def _adjustTable(self, rowIndex=None, notifyFields=True, reserve=0):
         """
-        Resizes the table length at index + 1 + reserve when the reserve reaches 0 (rowIndex = length if set to None).
-        Also regenerates the table and fieldMap if columns have changed.
-          The table update is done according to:
-            - the fieldNames considered as up to date;
-            - the fieldMap considered as old but still describing the non updated table.
-          Then update the fieldMap
+        Makes sure every column can hold at least index + 2 + reserve rows (rowIndex = length - 1 if set to None).
+        The allocated capacity grows geometrically (x1.5) when room is missing, so that filling the
+        datacube row by row costs an amortized O(1) reallocation per commit instead of O(length).
+        Also allocates the arrays of new fields and discards the arrays of removed fields,
+        so that the stored columns agree with the fieldNames considered as up to date.
+        Then update the fieldMap.
         Finally send notifications of the field names if notifyFields =True
         Does not change the length of the datacube => Use extendTo to change both the table and the datacube length
         """
-        self.debugPrint('In ', self._meta["name"], '._adjustTable(rowIndex=', rowIndex, ',reserve=', reserve, ')')
-        fieldNames, fieldMap, ta = self._meta["fieldNames"], self._meta["fieldMap"], self._table
-        nbrCols = len(fieldNames)
-        # if nbrCols==0:                                      # if all columns deleted
-        #  self._table=None                                  # reset table to None and return
-        # else:
+        if self._debug:
+            self.debugPrint('In ', self._meta["name"], '._adjustTable(rowIndex=', rowIndex, ',reserve=', reserve, ')')
+        fieldNames, columns = self._fieldNames, self._columns
         if rowIndex is None:
-            rowIndex = self._meta["length"] - 1
+            rowIndex = self._length - 1
         reserve = int(max(reserve, 0))
         nbrRows = rowIndex + 2 + reserve
-        unchangedCols = len(fieldNames) == len(fieldMap) and all(
-            [fieldNames[fieldMap[field]] == field for field in fieldMap])  # true also for empty fieldNames and fieldMap
-        if unchangedCols and ta is not None:                   # if fields (colum names) have'nt changed
-            if rowIndex >= len(self._table):  # => adjust only if room is missing
-                self._resize((nbrRows, nbrCols))  # => simple resizing without any copy
-        else:                                             # else if column have changed
-            if ta is not None:
-                nbrRows = max(nbrRows, len(ta))
-            newarray = zeros((nbrRows, nbrCols), dtype=self._meta["dataType"])  # create and new array
-            if ta is not None:  # and if the table already exist begin to copy the old data in the new array:
-                for i in range(nbrCols):  # copy column by column the old columns
-                    if fieldNames[i] in fieldMap:  # determine if the column i exists in the previous fieldMap
-                        j = fieldMap[fieldNames[i]]
-                        newarray[:len(ta), i] = ta[:, j]  # copy from the old to new array
-            self._table = newarray                          # update table with new array
-        # update the fieldMap. It is now again in agreement with the fieldName list.
-        self.updateFieldMap()
+        grown = nbrRows > self._capacity
+        if grown:                                              # grow capacity geometrically, never shrink it here
+            self._capacity = max(nbrRows, int(self._capacity * 1.5) + 8)
+        if self._schemaDirty:                                  # fields changed => reconcile columns and maps
+            fieldDtypes = self._meta.setdefault("fieldDtypes", dict())  # setdefault for cubes saved before fieldDtypes existed
+            for name in fieldNames:
+                if name not in columns:                        # new field => allocate its column with its own dtype
+                    columns[name] = zeros(self._capacity, dtype=fieldDtypes.get(name, self._dataType))
+                elif len(columns[name]) < self._capacity:      # existing field => resize only if room is missing
+                    columns[name].resize(self._capacity, refcheck=False)
+            fieldNameSet = set(fieldNames)                     # set for O(1) membership below
+            for name in columns.keys():                        # discard the columns of removed fields
+                if name not in fieldNameSet:
+                    del columns[name]
+            for name in fieldDtypes.keys():                    # and their per-column dtypes, so that a
+                if name not in fieldNameSet:                   # later column of the same name is not
+                    del fieldDtypes[name]                      # allocated from a stale entry
+            # fieldMap and indexToName are maintained incrementally at the mutation sites,
+            # so no rebuild is needed here
+            self._schemaDirty = False
+        elif grown:                                            # schema untouched => just resize the columns
+            for column in columns.values():
+                column.resize(self._capacity, refcheck=False)
         if notifyFields:
-            self.debugPrint(self.name(), '._adjustTable  notifying "names" with fieldNames=', self._meta["fieldNames"])
-            self.notify('names', self._meta['fieldNames'])
+            if self._debug:
+                self.debugPrint(self.name(), '._adjustTable  notifying "names" with fieldNames=', self._fieldNames)
+            self.notify('names', self._fieldNames)
 
     ######################
     # column management
@@ -542,19 +829,13 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
         """
         Returns a column name from its index
         """
-        for key in self._meta['fieldMap'].keys():
-            if self._meta['fieldMap'][key] == index:
-                return key
-        return None
+        return self._indexToName.get(index)
 
     def columnIndex(self, name):
         """
         Returns a column index from its name or None if the column does not exist
         """
-        i = None
-        if name in self._meta["fieldMap"]:
-            i = self._meta["fieldMap"][name]
-        return i
+        return self._fieldMap.get(name)
 
     def renameColumn(self, oldName, newName):
         """
@@ -563,33 +844,55 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
         """
         # print 'in datacube.renameColumn(',oldName,',',newName,')'
         self.setModified()
-        fN = self._meta["fieldNames"]
+        fN = self._fieldNames
         if newName is None:
             newName = self.newColumnName()
         if oldName in fN:
             fN[fN.index(oldName)] = newName
-            self.updateFieldMap()
-        self.notify("names", self._meta["fieldNames"])
+            if oldName in self._columns:
+                self._columns[newName] = self._columns.pop(oldName)
+            # O(1) update of both maps instead of a full rebuild
+            index = self._fieldMap.pop(oldName)
+            self._fieldMap[newName] = index
+            self._indexToName[index] = newName
+            fieldDtypes = self._meta.get("fieldDtypes", dict())
+            if oldName in fieldDtypes:                 # the per-column dtype follows the column
+                fieldDtypes[newName] = fieldDtypes.pop(oldName)
+        self.notify("names", self._fieldNames)
 
     def column(self, name):
         """
-        Returns a given column of the datacube (i.e. the table from index 0 to length-1)
+        Returns a given column of the datacube (i.e. its array from index 0 to length-1), as a zero-copy view
         """
-        if name in self._meta["fieldMap"]:
-            return self._table[:self._meta["length"], self._meta["fieldMap"][name]]
+        columns = self._columns
+        if name in columns:
+            return columns[name][:self._length]
         return None
 
     def columns(self, names):
         """
-        Returns a table containing a set of given columns from their names
+        Returns a table containing a set of given columns from their names.
+        A single name returns the 1D column itself (a zero-copy view);
+        several names are stacked into a 2D array (a copy, promoted to the common dtype of the columns).
         """
-        indices = []
-        for i in range(0, len(names)):
-            indices.append(self._meta["fieldMap"][names[i]])
-        if len(indices) == 1:
-            return self.table()[:, indices[0]]
+        length = self._length
+        columns = self._columns
+        cols = [columns[name][:length] for name in names]
+        if len(cols) == 1:
+            return cols[0]
         else:
-            return self.table()[:, indices]
+            return column_stack(cols)
+
+    def columnViews(self, names):
+        """
+        Returns a list of the given columns as zero-copy 1D views, in the order of the passed names.
+        Use this instead of columns(names) for read-only multi-column access:
+        stacking several columns into a 2D block necessarily copies them,
+        whereas the views let vectorized operations run directly on the stored arrays.
+        """
+        length = self._length
+        columns = self._columns
+        return [columns[name][:length] for name in names]
 
     def removeColumns(self, namesOrIndices, notify=True):
         """
@@ -601,21 +904,26 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
         names = []
         for nameOrIndex in namesOrIndices:
             if isinstance(nameOrIndex, basestring):
-                if nameOrIndex in self._meta["fieldNames"]:
+                if nameOrIndex in self._fieldNames:
                     names.append(nameOrIndex)
-            elif isinstance(nameOrIndex, int) and nameOrIndex < len(self._meta["fieldNames"]):
+            elif isinstance(nameOrIndex, int) and nameOrIndex < len(self._fieldNames):
                 names.append(self.columnName(nameOrIndex))
+        fieldDtypes = self._meta.get("fieldDtypes", dict())
         for name in names:
-            if name in self._meta["fieldNames"]:
-                del self._meta["fieldNames"][self._meta["fieldNames"].index(name)]
-        self._adjustTable(notifyFields=False)  # will also update the fieldMap
+            if name in self._fieldNames:
+                del self._fieldNames[self._fieldNames.index(name)]
+            if name in self._columns:
+                del self._columns[name]      # just drop the column array: no table rebuild needed
+            fieldDtypes.pop(name, None)      # forget the per-column dtype with the column
+        self.updateFieldMap()
         if notify:
-            self.debugPrint('datacube.removeColumn with datacube ', self.name(),
-                            ' notifying "names" with names=', self._meta["fieldNames"])
-            self.notify("names", self._meta["fieldNames"])
-            self.debugPrint('datacube.removeColumn with datacube ', self.name(),
-                            ' notifying "commit" with rowIndex=', self._meta["index"])
-            self.notify("commit", self._meta["index"])
+            with self.batch():
+                self.debugPrint('datacube.removeColumn with datacube ', self.name(),
+                                ' notifying "names" with names=', self._fieldNames)
+                self.notify("names", self._fieldNames)
+                self.debugPrint('datacube.removeColumn with datacube ', self.name(),
+                                ' notifying "commit" with rowIndex=', self._meta["index"])
+                self.notify("commit", self._meta["index"])
 
     def removeColumn(self, nameOrIndex, notify=True):
         """
@@ -633,27 +941,27 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
     def newColumnName(self):
         """
         Forms a new name of the form 'New_i' with i a not already used identifier.
+        A persistent counter remembers the last identifier attributed, and membership is
+        tested against a set, so successive calls do not rescan the whole name list.
         """
-        names = self._meta["fieldNames"]
-        i = 1
-        while True:
-            name = "New_" + str(i)
+        names = set(self._fieldNames)
+        i = self._nextNewId
+        while "New_" + str(i) in names:
             i += 1
-            if name not in names or i > 1000:
-                break
-        if i <= 1000:
-            return name
-        else:
-            return None
+            if i > 1000:
+                return None
+        self._nextNewId = i + 1
+        return "New_" + str(i)
 
     def _addFields(self, nameIndexDict, adjustTable=True):
         """
         PRIVATE FUNCTION called by createCol and set
-        Insert new field names (i.e. column names) in self._meta["fieldNames"] and adjust accordingly the fieldMap and the cube's table.
+        Insert new field names (i.e. column names) in self._fieldNames and adjust accordingly the fieldMap and the cube's table.
         """
         self.setModified()
-        self.debugPrint('In ', self._meta["name"], '_addFields(nameIndexDict=',
-                        nameIndexDict, ',adjustTable=', adjustTable, ')')
+        if self._debug:
+            self.debugPrint('In ', self._meta["name"], '_addFields(nameIndexDict=',
+                            nameIndexDict, ',adjustTable=', adjustTable, ')')
         newField = False
         sortedNames = sorted(nameIndexDict, key=nameIndexDict.get)
         colIndex = None
@@ -664,7 +972,7 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
             existingColIndex = self.columnIndex(name)
             if existingColIndex == None:                                # if field already present don't do anything
                 newField = True                                           # name not in fieldNames=> new names to notify soon
-                nbrCols = len(self._meta["fieldNames"])
+                nbrCols = len(self._fieldNames)
                 if colIndex != None and colIndex < 0:                       # an index was indicated
                     # realculate its positive value if negative (relative to the end)
                     colIndex = nbrCols + colIndex + 1
@@ -672,7 +980,17 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
                         colIndex = 0                             # if still negative insert at index 0
                 if colIndex == None or colIndex > nbrCols:               # if name and index not given or index too large
                     colIndex = nbrCols  # insert at index length (first free index)
-                self._meta["fieldNames"].insert(colIndex, name)          # insert the name in fieldNames
+                self._fieldNames.insert(colIndex, name)          # insert the name in fieldNames
+                self._schemaDirty = True                                 # the column arrays now lag behind
+                # maintain both maps incrementally: O(1) for the usual append at the end,
+                # one shifting pass for an insertion in the middle
+                fieldMap, indexToName = self._fieldMap, self._indexToName
+                for i in range(nbrCols - 1, colIndex - 1, -1):
+                    shiftedName = indexToName[i]
+                    fieldMap[shiftedName] = i + 1
+                    indexToName[i + 1] = shiftedName
+                fieldMap[name] = colIndex
+                indexToName[colIndex] = name
             else:
                 colIndex = existingColIndex
         if adjustTable:
@@ -682,44 +1000,57 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
     def createColumn(self, name, values, offset=0):
         """
         OBSOLETE AND MAINTAINED FOR COMPATIBILITY ISSUES. USE createCol INSTEAD
-        Creates a new column
+        Creates a new column and writes the values in a single vectorized assignment
+        (instead of one Python-level set+commit round-trip per element), with a single
+        commit notification at the end. The current row index is left unchanged.
         """
-        self.setModified()
-        index = self.index()
-        self.goTo(offset)
-        for value in values:
-            self.set(**{name: value})
-            self.commit()
-        self.goTo(index)
+        with self.batch():
+            self.createCol(name=name, values=values, offsetRow=offset)
 
-    def createCol(self, name=None, columnIndex=None, offsetRow=0, values=None, notify=True, **kwargs):
+    def createCol(self, name=None, columnIndex=None, offsetRow=0, values=None, dtype=None, notify=True, **kwargs):
         """
         If it does not already exist, creates a new column and inserts it at index columnIndex or at the end if index is not specified or invalid;
         If it already exists, overwrites it.
+        The column is allocated with the passed dtype if any (e.g. int32, float32, complex64),
+        or with the datacube's default dataType otherwise;
+        a narrower dtype halves the memory traffic of the column scans compared to float64.
         Then update the length if the new inserted data exceed the previous length.
         Then sets the passed values (if any) starting from row index = offset.
         Then sends notifications if notify is true.
         """
         self.setModified()
-        self.debugPrint('In ', self._meta["name"], 'createCol(name=', name, ',columnIndex=',
-                        columnIndex, ',offsetRow=', offsetRow, ',values=', values, ', notify=', notify, ')')
+        if self._debug:
+            self.debugPrint('In ', self._meta["name"], 'createCol(name=', name, ',columnIndex=',
+                            columnIndex, ',offsetRow=', offsetRow, ',values=', values, ', notify=', notify, ')')
         # Update fieldNames but wait before adjusting the table that we know adapt the length to the passed rows
         newField, columnIndex = self._addFields({name: columnIndex}, adjustTable=False)
-        if values != None:
+        if dtype is not None:
+            self._meta.setdefault("fieldDtypes", dict())[self._fieldNames[columnIndex]] = dtype
+        if values is not None:
             if offsetRow < 0:
-                offsetRow = self._meta["length"] + offsetRow + 1  # offsetRow is the index where to start to write
+                offsetRow = self._length + offsetRow + 1  # offsetRow is the index where to start to write
             if offsetRow < 0:
                 offsetRow = 0
             maxRow = offsetRow + len(values)                            # maxRow is the final length
-            if maxRow > self._meta["length"]:
-                self._meta["length"] = maxRow
-        # adjusts both the table and the fieldMap according to fieldNames
+            if maxRow > self._length:
+                self._length = maxRow
+            if newField:
+                # allocate the new column with empty instead of zeros: the block about to be
+                # overwritten by the values below need not be zero-filled first, only the
+                # regions outside it, which must read as 0 when later rows are committed
+                fieldName = self._fieldNames[columnIndex]
+                fieldDtype = self._meta.setdefault("fieldDtypes", dict()).get(fieldName, self._dataType)
+                column = empty(max(self._capacity, maxRow), dtype=fieldDtype)
+                column[:offsetRow] = 0
+                column[maxRow:] = 0
+                self._columns[fieldName] = column
+        # adjusts both the columns and the fieldMap according to fieldNames
         self._adjustTable(notifyFields=False)
-        if values != None:
-            self._table[offsetRow:maxRow, columnIndex] = values
+        if values is not None:
+            self._columns[self.columnName(columnIndex)][offsetRow:maxRow] = values
         if notify:
-            self.notify("names", self._meta["fieldNames"])
-            if values != None:
+            self.notify("names", self._fieldNames)
+            if values is not None:
                 self.notify("commit")
 
     #################
@@ -734,10 +1065,22 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
 
     def rowAt(self, index):
         """
-        Returns a row at a given index
+        Returns a row at a given index, built by gathering one element from each column
         """
         if index != None and index < len(self):
-            return self._table[index, :]
+            # let numpy promote to the common dtype of the columns
+            return array([self._columns[name][index] for name in self._fieldNames])
+
+    def rows(self, indices):
+        """
+        Returns the rows at the given indices as a 2D array (one row per index),
+        gathered with a single fancy-indexing call per column instead of one rowAt call per index.
+        """
+        indices = array(indices, dtype=intp)
+        columns = self._columns
+        if not self._fieldNames:
+            return zeros((len(indices), 0), dtype=self._dataType)
+        return column_stack([columns[name][indices] for name in self._fieldNames])
 
     def setIndex(self, index):
         """
@@ -750,24 +1093,26 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
         Sets the current row index to a given index comprised between 0 (first element) and length (first outside row)
         If row not given, goes to first element (index 0)
         """
-        if row <= self._meta["length"]:
+        if row <= self._length:
             self._meta["index"] = row
 
     def goToEnd(self):
         """
         Sets the current row index to datacube length (first outside row)
         """
-        self._meta["index"] = self._meta["length"]
+        self._meta["index"] = self._length
 
     def clearRow(self):
         """
         Sets all values in the current row to 0
         """
         self.setModified()
-        if self._meta["index"] != None:
-            for i in range(0, len(self._table[self._meta["index"], :])):
-                self._table[self._meta["index"], i] = 0
-        self.debugPrint('datacube.clearRow with datacube ', self.name(), ' notifying "clearRow"')
+        row = self._meta["index"]
+        if row is not None:
+            for column in self._columns.itervalues():
+                column[row] = 0
+        if self._debug:
+            self.debugPrint('datacube.clearRow with datacube ', self.name(), ' notifying "clearRow"')
         self.notify("clearRow")
 
     def removeRow(self, row, notify=False):
@@ -775,12 +1120,24 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
         Removes a given row from the datacube.
         """
         self.setModified()
-        if row < self._meta["length"]:
-            self._table[row:-1, :] = self._table[row + 1:, :]
-            self._meta["length"] -= 1
+        length = self._length
+        if row < length:
+            import ctypes
+            nbrMoved = length - 1 - row
+            for column in self._columns.itervalues():
+                if nbrMoved > 0:
+                    if column.flags['C_CONTIGUOUS']:
+                        # overlapping forward copy: a single memmove avoids numpy's aliasing temporary
+                        itemsize = column.itemsize
+                        base = column.ctypes.data
+                        ctypes.memmove(base + row * itemsize, base + (row + 1) * itemsize, nbrMoved * itemsize)
+                    else:
+                        column[row:length - 1] = column[row + 1:length]
+            self._length = length - 1
         if self._meta["index"] >= row:
             self._meta["index"] -= 1
-        self.debugPrint('datacube.removeRow with datacube ', self.name(), ' notifying ""removeRow"" with row=', row)
+        if self._debug:
+            self.debugPrint('datacube.removeRow with datacube ', self.name(), ' notifying ""removeRow"" with row=', row)
         if notify:
             self.notify("commit", row)
 
@@ -789,15 +1146,27 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
         Removes a list of rows from the datacube.
         """
         if rows and len(rows) != 0:
-            sortedRows = reversed(sorted(rows))  # important to reverse for sequential removing
-            for row in sortedRows:
-                self.removeRow(row, notify=False)
-                if notify:
-                    self.notify("commit", row)
+            length = self._length
+            validRows = set(row for row in rows if 0 <= row < length)
+            if not validRows:
+                return
+            self.setModified()
+            keep = ones(length, dtype=bool)
+            keep[list(validRows)] = False
+            newLength = length - len(validRows)
+            for column in self._columns.itervalues():
+                column[:newLength] = column[:length][keep]
+            self._length = newLength
+            index = self._meta["index"]
+            if index is not None:
+                self._meta["index"] = index - len([row for row in validRows if row <= index])
+            if notify:
+                self.notify("commit", min(validRows))
 
     def addRow(self, notify=False):
         self.setModified()
-        self.debugPrint(self._meta["name"], '.addRow(notify=', notify, ')')
+        if self._debug:
+            self.debugPrint(self._meta["name"], '.addRow(notify=', notify, ')')
         self.commit(rowIndex=len(self), gotoNextRow=False)
 
     def insertRow(self, rowIndex=None, before=True, notify=False, commit=False, **keys):
@@ -810,23 +1179,26 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
           Note: changing the datacube's current row index with commit can be dangerous if several callers update the datacube simultaneously.
         """
         self.setModified()
-        str1 = ''
-        for key in keys:
-            str1 = str1 + key + "=" + str(keys[key]) + ','
-        self.debugPrint(self._meta["name"], '.insertRow(rowIndex=', rowIndex, ',before=',
-                        before, ',notify=', notify, ',commit=', commit, str1, ')')
+        if self._debug:
+            str1 = ''
+            for key in keys:
+                str1 = str1 + key + "=" + str(keys[key]) + ','
+            self.debugPrint(self._meta["name"], '.insertRow(rowIndex=', rowIndex, ',before=',
+                            before, ',notify=', notify, ',commit=', commit, str1, ')')
         oldIndex = self._meta["index"]
         if rowIndex == None:
             index = self._meta["index"]
         elif rowIndex < 0:
-            index = self._meta["length"] + rowIndex
+            index = self._length + rowIndex
         else:
             index = rowIndex
         if not before:
             index += 1
-        if index < self._meta["length"]:
-            self.extendTo(rowIndex=self._meta["length"])         # extend datacube table if needed
-            self._table[index + 1:, :] = self._table[index:-1, :]  # copy and paste one row below
+        length = self._length
+        if index < length:
+            self.extendTo(rowIndex=length)         # extend datacube table if needed
+            for column in self._columns.itervalues():
+                column[index + 1:length + 1] = column[index:length]    # shift only the live rows one row down
         # call set without propagating notify and commit (managed directly below)
         self.set(rowIndex=index, **keys)
         if oldIndex >= index:
@@ -845,19 +1217,51 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
     def insertRows(self, rowIndex=None, before=True, notify=False, commit=False, numberOfRows=1, **keys):
         """
         Insert a series of adjacent rows before or after a given row index, or at the current index if index=None.
+        The tail of the table is shifted only once by numberOfRows and the new rows are written in a single
+        broadcast assignment per column, instead of one full shift and one set per inserted row.
         """
         self.setModified()
-        str1 = ''
+        if self._debug:
+            str1 = ''
+            for key in keys:
+                str1 = str1 + key + "=" + str(keys[key]) + ','
+            self.debugPrint(self._meta["name"], '.insertRows(rowIndex=', rowIndex, ',before=', before,
+                            ',numberOfRows=', numberOfRows, ',notify=', notify, ',commit=', commit, str1, ')')
+        n = numberOfRows
+        if n <= 0:
+            return
+        oldIndex = self._meta["index"]
+        if rowIndex == None:
+            index = self._meta["index"]
+        elif rowIndex < 0:
+            index = self._length + rowIndex
+        else:
+            index = rowIndex
+        if not before:
+            index += 1
+        nameIndexDict = dict()                       # create all missing columns in one pass
+        i = len(self._fieldNames)
+        for key in keys:
+            if key not in self._fieldMap:
+                nameIndexDict[key] = i
+                i += 1
+        newFields, colIndex = self._addFields(nameIndexDict, adjustTable=False)
+        length = self._length
+        self.extendTo(rowIndex=length + n - 1)       # extend datacube table if needed
+        if index < length:
+            for column in self._columns.itervalues():
+                column[index + n:length + n] = column[index:length]      # single tail shift by n rows
         for key in keys:
-            str1 = str1 + key + "=" + str(keys[key]) + ','
-        self.debugPrint(self._meta["name"], '.insertRows(rowIndex=', rowIndex, ',before=', before,
-                        ',numberOfRows=', numberOfRows, ',notify=', notify, ',commit=', commit, str1, ')')
-        for i in range(numberOfRows):
-            self.insertRow(rowIndex=rowIndex + i, before=before, notify=False, commit=False, **keys)
+            self._columns[key][index:index + n] = keys[key]
+        if oldIndex >= index:
+            self._meta["index"] += n           # by default the data pointed to by index are the same as before
+        if newFields:
+            self.notify("names", self._fieldNames)
         if commit:
             self.commit()              # if commit is forced, current row becomes index+1 (dangerous)
         elif notify:
-            self.notify("commit")  # notification sent
+            # single notification carrying the inserted range [index, index + n)
+            self.notify("commit", (index, index + n))
 
     def extendTo(self, rowIndex=None, reserve=0, extendLength=False):
         """
@@ -865,13 +1269,19 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
         By default extendLength is false and the length of the datacube is not changed.
         (one usually extends the length with commit).
         """
-        self.debugPrint('In ', self._meta["name"], 'extendTo(rowIndex=', rowIndex,
-                        ',reserve=', reserve, ',extendLength=', extendLength, ')')
+        if self._debug:
+            self.debugPrint('In ', self._meta["name"], 'extendTo(rowIndex=', rowIndex,
+                            ',reserve=', reserve, ',extendLength=', extendLength, ')')
         if rowIndex == None:
             rowIndex = self._meta["index"]
+        # steady-state append: nothing to allocate or reconcile, so skip _adjustTable entirely
+        if rowIndex + 2 + reserve <= self._capacity and not self._schemaDirty:
+            if extendLength and rowIndex >= self._length:
+                self._length = rowIndex + 1
+            return
         self._adjustTable(rowIndex=rowIndex, reserve=reserve, notifyFields=False)
-        if extendLength and rowIndex >= self._meta["length"]:
-            self._meta["length"] = rowIndex + 1
+        if extendLength and rowIndex >= self._length:
+            self._length = rowIndex + 1
 
     def set(self, rowIndex=None, notify=False, commit=False, columnOrder=None, extendLength=False, **keys):
         """
@@ -886,12 +1296,13 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
         Important: This function does not change the datacube's current row index unless commit is explicitely set to true.
           WARNING: changing the datacube's current row index is dangerous if several callers edit the datacube simultaneously.
         """
-        str1 = ''
-        for key in keys:
-            str1 = str1 + ',' + key + "=" + str(keys[key])
-        self.debugPrint('In ', self._meta["name"], '.set(rowIndex=', rowIndex, ',notify=', notify,
-                        ',commit=', commit, ',columnOrder=', columnOrder, ',extendLength=', extendLength, str1, ')')
-        existingKeys = self._meta["fieldNames"]
+        if self._debug:
+            str1 = ''
+            for key in keys:
+                str1 = str1 + ',' + key + "=" + str(keys[key])
+            self.debugPrint('In ', self._meta["name"], '.set(rowIndex=', rowIndex, ',notify=', notify,
+                            ',commit=', commit, ',columnOrder=', columnOrder, ',extendLength=', extendLength, str1, ')')
+        existingKeys = self._fieldNames
         specifiedKeys = []                                       # Build a list of fields (column names) to be added
         # Put in it first the keys of columnOrder (even if no specified value) if not already existing
         if columnOrder:
@@ -902,7 +1313,8 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
             for key in keys:
                 if key not in specifiedKeys and key not in existingKeys:
                     specifiedKeys.append(key)
-        self.debugPrint('keys in order are ', specifiedKeys)
+        if self._debug:
+            self.debugPrint('keys in order are ', specifiedKeys)
         nameIndexDict = dict()
         i = len(existingKeys)
         for key in specifiedKeys:
@@ -913,27 +1325,49 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
         if rowIndex is None:
             rowIndex = self._meta["index"]     # defines the row index for the set
         elif rowIndex < 0:
-            rowIndex = self._meta["length"] + rowIndex
+            rowIndex = self._length + rowIndex
         if rowIndex < 0:
             rowIndex = 0
         # now adjustTable to correct the fieldmap and increase the table length
-        self.extendTo(rowIndex=rowIndex, reserve=500, extendLength=extendLength)
+        self.extendTo(rowIndex=rowIndex, extendLength=extendLength)    # geometric capacity growth makes a reserve useless
         newData = False
+        columns = self._columns
         for key in keys:                                        # for each key
             newData = True
-            columnIndex = self._meta["fieldMap"][key]
-            self._table[rowIndex, columnIndex] = keys[key]         # add the corresponding value in the table
+            columns[key][rowIndex] = keys[key]             # add the corresponding value in its column
         if newFields:
-            self.debugPrint('datacube ', self.name(), 'notifying "names"=', self._meta["fieldNames"])
-            self.notify("names", self._meta["fieldNames"])  # send only one notification if new names have been added
+            if self._debug:
+                self.debugPrint('datacube ', self.name(), 'notifying "names"=', self._fieldNames)
+            self.notify("names", self._fieldNames)  # send only one notification if new names have been added
         if newData:
             if commit:
                 self.commit(rowIndex=rowIndex)                  # and commit if requested
             elif notify:
-                self.debugPrint('datacube ', self.name(), 'notifying "commit" with index=', rowIndex)
+                if self._debug:
+                    self.debugPrint('datacube ', self.name(), 'notifying "commit" with index=', rowIndex)
                 self.notify("commit", rowIndex)
         self._unsaved = True
 
+    def setColumns(self, offsetRow=0, columnOrder=None, notify=True, **columnValues):
+        """
+        Bulk equivalent of repeated set+commit calls: writes whole arrays of values into several
+        columns at once, creating the missing columns, with one C-level copy per column instead of
+        one Python-level round-trip per row.
+        columnValues maps column names to arrays (or sequences) of values, all of the same length,
+        written starting at row index offsetRow.
+        Use keyword 'columnOrder' with a list of column names to force the creation order of new columns.
+        The datacube length is extended to cover the written rows and a single coalesced
+        notification is sent at the end if notify is true.
+        """
+        with self.batch():
+            names = list(columnOrder) if columnOrder else []
+            for name in columnValues:
+                if name not in names:
+                    names.append(name)
+            for name in names:
+                # a name listed in columnOrder without values still creates its (empty) column
+                self.createCol(name=name, values=columnValues.get(name), offsetRow=offsetRow, notify=notify)
+
     def setAt(self, index, **keys):
         """
         OBSOLETE: USE THE MORE POWERFUL METHOD set INSTEAD.
@@ -953,10 +1387,11 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
         VERY IMPORTANT: When several clients are editing the database at the same time, only one should use commit with the default gotoNextRow=True,
         otherwise they compete for the row index of the next write !!!
         """
-        self.debugPrint('In', self._meta["name"], '.commit (rowIndex=', rowIndex, ',gotoNextRow=', gotoNextRow, ')')
+        if self._debug:
+            self.debugPrint('In', self._meta["name"], '.commit (rowIndex=', rowIndex, ',gotoNextRow=', gotoNextRow, ')')
         if rowIndex == None:
             rowIndex = self._meta["index"]
-        if rowIndex >= self._meta["length"]:
+        if rowIndex >= self._length:
             self.extendTo(rowIndex=rowIndex, extendLength=True)
         if gotoNextRow:
             self._meta["index"] = rowIndex + 1  # possibly 1st row outside datacube
@@ -967,12 +1402,15 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
         """
         Sorts the datacube by a given variable
         """
-        col = list(self.column(column))
-        indices = zip(col, range(0, len(col)))
-        sortedValues, sortedIndices = zip(*sorted(indices, reverse=reverse))
-        self._table = self._table[sortedIndices, :]
+        length = self._length
+        order = self.column(column).argsort(kind='mergesort')    # stable sort
+        if reverse:
+            order = order[::-1]
+        for col in self._columns.itervalues():
+            col[:length] = col[:length][order]
         # To do: Add sorting of children!?
-        self.debugPrint('datacube.sortBy with datacube ', self.name(), ' notifying "sortBy" with column=', column)
+        if self._debug:
+            self.debugPrint('datacube.sortBy with datacube ', self.name(), ' notifying "sortBy" with column=', column)
         self.notify("sortBy", column)
 
     def search(self, **kwargs):
@@ -983,22 +1421,20 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
         If no row matches the given criteria, search will return [].
         """
         keys = kwargs.keys()
-        cols = dict()
-        foundRows = []
-        dtype = self.table().dtype
+        if not keys:
+            return []
+        mask = None
         for key in keys:                      # return [] if one of the requested column does not exist
-            cols[key] = self.column(key)
-            if cols[key] == None:
+            col = self.column(key)
+            if col is None:
                 return []
-        for i in range(0, len(cols[keys[0]])):
-            found = True
-            for key in keys:
-                if not allclose(array(kwargs[key], dtype=dtype), cols[key][i]):
-                    found = False
-                    break
-            if found:
-                foundRows.append(i)
-        return foundRows
+            value = kwargs[key]
+            if col.dtype.kind in 'fc':        # tolerant comparison only makes sense for floats
+                keyMask = isclose(col, value)
+            else:                             # integers and booleans compare exactly, against the
+                keyMask = col == value        # uncast value: a lossy cast would fabricate matches
+            mask = keyMask if mask is None else mask & keyMask
+        return flatnonzero(mask).tolist()
 
     #**************************************************************************
     # Methods for children management
@@ -1016,17 +1452,18 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
         Removes a given child (defined by its cube) from the datacube and delete it from memory if deleteChildCube =True.
         Deletion propagates to all descendants.
         """
-        for child in self._children:
-            if child.datacube() == childCube:
-                child.datacube().setParent(None)
-                self._children.remove(child)                 # remove from the list of children in the parent
-                # remove child from memory (does not delete the datacube itself)
-                del child
-                self.notify("removeChild", childCube)         # notify of the deletion
-                if deleteChildCube:                          # if child cube and its descendents to be deleted
-                    for child2 in childCube._children:         # call recursively the function to delete descendents
-                        childCube.removeChild(child2._datacube, deleteChildCube=deleteChildCube)
-                    del deleteChildCube                        # and delete the child cube
+        item = self._childIndex.pop(id(childCube), None)
+        if item is not None:
+            childCube.setParent(None)
+            self._children.remove(item)                  # remove from the list of children in the parent
+            self._unindexChildAttributes(item)
+            self._childrenCache = None
+            self.notify("removeChild", childCube)         # notify of the deletion
+            if deleteChildCube:                          # if child cube and its descendents to be deleted
+                for child2 in list(childCube._children):   # call recursively the function to delete descendents
+                    childCube.removeChild(child2._datacube, deleteChildCube=deleteChildCube)
+            item.reset()
+            self._childPool.append(item)                 # park the item for reuse by addChild
         self._unsaved = True
         return
 
@@ -1045,11 +1482,18 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
             # a datacube added as a child always have a 'row' attribute, which is set to the current row index on adding
             attributes["row"] = self.index()
         self.debugPrint('attributes = ', attributes)
-        item = ChildItem(childCube, attributes)
+        if self._childPool:
+            item = self._childPool.pop().rebind(childCube, attributes)
+        else:
+            item = ChildItem(childCube, attributes)
         if childCube.parent() != None:             # a datacube can be the child of only one parent
             childCube.parent().removeChild(childCube)
         childCube.setParent(self)
         self._children.append(item)
+        self._childIndex[id(childCube)] = item
+        for key, value in attributes.items():
+            self._indexChildAttribute(item, key, value)
+        self._childrenCache = None
         self.debugPrint('datacube.addChild with datacube ', self.name(), ' notifying "addChild" with cube=', childCube)
         self.notify("addChild", childCube)
         self.setModified()
@@ -1059,49 +1503,117 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
         """
         Returns attribute keys of all children if common=False, or common to all children if common = True.
         """
-        attributeKeys = []
-        childrenCubes = self.children()  # actually children cubes and not children
-        if len(childrenCubes) > 0:
-            attributeKeys = set(self.attributesOfChild(childrenCubes[0]).keys())  # initialize
-            for child in childrenCubes[1:-1]:
-                keys = set(self.attributesOfChild(child).keys())
-                if not common:
-                    attributeKeys |= keys      # Union and update
-                else:
-                    attributeKeys &= keys      # Intersection and update
-        return list(attributeKeys)
+        if len(self._children) == 0:
+            return []
+        keySets = [set(item.attributes().keys()) for item in self._children]
+        if common:
+            return list(set.intersection(*keySets))
+        return list(set.union(*keySets))
 
     def attributesOfChild(self, childCube):
         """
         Returns the attributes of a child defined by its cube
         """
-        childrenCubes = self.children()  # actually children cubes and not children
-        if childCube in childrenCubes:
-            i = childrenCubes.index(childCube)
-            return dict(self._children[i].attributes())  # return a copy (dict) to protect the attributes
+        item = self._childIndex.get(id(childCube))
+        if item is not None:
+            return dict(item.attributes())  # return a copy (dict) to protect the attributes
         raise AttributeError("Child not found!")
 
+    def _rebuildChildIndex(self):
+        """
+        Rebuilds the id-keyed child index, whose keys are not stable across a
+        pickle round trip.
+        """
+        self._childIndex = dict((id(item.datacube()), item) for item in self._children)
+
+    def _indexChildAttribute(self, item, key, value):
+        """
+        Records (key, value) -> item in the children attribute index.
+        A key whose values turn out to be unhashable is disabled (set to None) and
+        queried through the linear scan instead.
+        """
+        valueIndex = self._childAttrIndex.get(key)
+        if valueIndex is None:
+            if key in self._childAttrIndex:
+                return                              # key disabled: an unhashable value was seen
+            valueIndex = self._childAttrIndex[key] = dict()
+        try:
+            valueIndex.setdefault(value, set()).add(item)
+        except TypeError:
+            self._childAttrIndex[key] = None        # disable the key for indexing
+
+    def _unindexChildAttributes(self, item):
+        """
+        Removes an item from the children attribute index.
+        """
+        for key, value in item.attributes().items():
+            valueIndex = self._childAttrIndex.get(key)
+            if valueIndex is None:
+                continue
+            try:
+                items = valueIndex.get(value)
+            except TypeError:
+                continue
+            if items is not None:
+                items.discard(item)
+
     def setChildAttributes(self, child, **kwargs):
         """
         Set a child attribute
         """
-        attributes = self.attributesOfChild(child)
+        item = self._childIndex.get(id(child))
+        if item is None:
+            raise AttributeError("Child not found!")
+        attributes = item.attributes()
         for key in kwargs:
+            valueIndex = self._childAttrIndex.get(key)
+            if valueIndex is not None and key in attributes:
+                try:
+                    valueIndex.get(attributes[key], set()).discard(item)
+                except TypeError:
+                    pass
             attributes[key] = kwargs[key]
+            self._indexChildAttribute(item, key, kwargs[key])
 
     def children(self, **kwargs):
         """
         Returns the list of all children datacubes verifying all the attributes passed in kwargs.
         Returns all children cubes if no kwargs are passed.
+        The list returned when no kwargs are passed is cached and shared between calls: do not mutate it.
         """
         if kwargs == {}:
-            return map(lambda x: x.datacube(), self._children)
+            cache = self._childrenCache
+            if cache is None:
+                cache = self._childrenCache = [item.datacube() for item in self._children]
+            return cache
         else:
+            result = None                      # try the attribute index first
+            useIndex = True
+            for key in kwargs:
+                valueIndex = self._childAttrIndex.get(key)
+                if valueIndex is None:
+                    if key in self._childAttrIndex:
+                        useIndex = False       # key disabled: fall back to the linear scan
+                        break
+                    return []                  # no child carries this attribute
+                try:
+                    items = valueIndex[kwargs[key]]
+                except KeyError:
+                    return []                  # no child carries this value
+                except TypeError:
+                    useIndex = False           # unhashable query value
+                    break
+                result = items if result is None else result & items
+                if not result:
+                    return []
+            if useIndex:
+                return [item.datacube() for item in self._children if item in result]
             children = []
             for item in self._children:
                 deviate = False
+                attributes = item.attributes()
                 for key in kwargs:
-                    if (not key in item.attributes()) or item.attributes()[key] != kwargs[key]:
+                    if (not key in attributes) or attributes[key] != kwargs[key]:
                         deviate = True
                         continue
                 if not deviate:
@@ -1112,10 +1624,21 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
     # Methods to load from and save to files
     #*******************************************************************************
 
-    def loadTable(self, filename, delimiter="\t", guessStructure=False):
+    def loadTable(self, filename, delimiter="\t", guessStructure=False, format='txt'):
         """
-        Loads the table of the datacube from a text file
+        Loads the table of the datacube from a text file,
+        or from a binary .npy blob written by saveTable(format='bin').
         """
+        if format == 'bin':
+            from numpy import load as npload
+            file = open(filename, "rb")
+            table = npload(file)
+            file.close()
+            fieldNames = self._fieldNames
+            self._columns = dict([(name, ascontiguousarray(table[:, i])) for i, name in enumerate(fieldNames)])
+            self._capacity = table.shape[0]
+            self._length = table.shape[0]
+            return
         def isnumeric(x):
             try:
                 int(x)
@@ -1146,41 +1669,57 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
             firstLineIsHeader = not all([isnumeric(name) for name in fieldNames])
             print fieldNames, firstLineIsHeader
             if firstLineIsHeader and len(lines) > 1:
-                self._meta["fieldNames"] = fieldNames
-                self._meta["length"] = len(lines) - 1
+                self._fieldNames = fieldNames
+                self._length = len(lines) - 1
             else:
                 fieldNames = ['field%i' % i for i in range(len(firstLine))]
-                self._meta["fieldNames"] = fieldNames
-                self._meta["length"] = len(lines)
+                self._fieldNames = fieldNames
+                self._length = len(lines)
                 start = 0
             if lines[1].find("j") == -1:
-                self._meta["dataType"] = float64
+                self._dataType = float64
             else:
-                self._meta["dataType"] = complex128
+                self._dataType = complex128
             self.updateFieldMap()
-        self._table = zeros((len(lines[start:]), len(self._meta["fieldNames"])), dtype=self._meta["dataType"])
-        self._meta["length"] = 0
+        fieldNames = self._fieldNames
+        fieldDtypes = self._meta.setdefault("fieldDtypes", dict())
+        nbrRows = len(lines[start:])
+        self._columns = dict([(name, zeros(nbrRows, dtype=fieldDtypes.get(name, self._dataType)))
+                              for name in fieldNames])
+        self._capacity = nbrRows
+        self._length = 0
+        if self._dataType != bool:
+            # fast path: let numpy parse the whole block in C instead of converting cell by cell
+            from numpy import loadtxt as nploadtxt
+            try:
+                table = nploadtxt(iter(lines[start:]), delimiter=delimiter, dtype=self._dataType, ndmin=2)
+                nbrCols = min(table.shape[1], len(fieldNames))
+                for j in range(nbrCols):
+                    self._columns[fieldNames[j]][:table.shape[0]] = table[:, j]
+                self._length = table.shape[0]
+                return
+            except (ValueError, IndexError):    # ragged or oddly delimited file: fall back to the slow parser
+                pass
+        # choose the cell converter once instead of testing the dtype for every cell
+        if self._dataType == complex128:
+            convert = complex
+        elif self._dataType == bool:
+            convert = lambda entry: entry != "False"
+        else:
+            convert = float
+        columns = self._columns
+        nbrFields = len(fieldNames)
         i = 0
         for line in lines[start:]:
-            entries = line.split(delimiter)
-            j = 0
             if line == "":
                 continue
-            for entry in entries:
+            j = 0
+            for entry in line.split(delimiter):
                 if entry != "":
-                    if self._meta["dataType"] == complex128:
-                        value = complex(entry)
-                    elif self._meta["dataType"] == bool:
-                        if entry == "False":
-                            value = 0
-                        else:
-                            value = 1
-                    else:
-                        value = float(entry)
-                    if j < len(self._meta["fieldNames"]) and i < self._table.shape[0]:
-                        self._table[i, j] = value
+                    if j < nbrFields and i < nbrRows:
+                        columns[fieldNames[j]][i] = convert(entry)
                     j += 1
-            self._meta["length"] += 1
+            self._length += 1
             i += 1
 
     def loadFromHdf5(self, path, verbose=False):
@@ -1225,22 +1764,30 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
         version = dataFile.attrs["version"]
 
         if version in ["0.1", "0.2"]:
-            self._meta = yaml.load(dataFile.attrs["meta"])
-            self._parameters = yaml.load(dataFile.attrs["parameters"])
+            self._meta = _restoreMetaDtypes(_yamlLoad(dataFile.attrs["meta"]))
+            self._parameters = _yamlLoad(dataFile.attrs["parameters"])
+        self._loadMetaAttrs()
 
         if len(self) > 0:
             ds = dataFile["table"]
-            self._table = empty(shape=ds.shape, dtype=ds.dtype)
-            self._table[:] = ds[:]
+            table = empty(shape=ds.shape, dtype=ds.dtype)    # contiguous row-major buffer
+            ds.read_direct(table)
+            fieldNames = self._fieldNames
+            self._columns = dict([(name, ascontiguousarray(table[:, i])) for i, name in enumerate(fieldNames)])
+            self._capacity = table.shape[0]
 
+        self._schemaDirty = True    # force a full reconciliation of columns and maps with the loaded meta
         self._adjustTable(reserve=0, notifyFields=False)
         self._children = []
+        self._childrenCache = None
+        self._childIndex = dict()
+        self._childAttrIndex = dict()
 
-        for key in sorted(map(lambda x: int(x), dataFile['children'].keys())):
+        for key in sorted([int(x) for x in dataFile['children'].keys()]):
             child = dataFile['children'][str(key)]
             cube = Datacube()
             cube.loadFromHdf5Object(child)
-            attributes = yaml.load(child.attrs["attributes"])
+            attributes = _yamlLoad(child.attrs["attributes"])
             self.addChild(cube, **attributes)
         self._unsaved = False
         self._meta["modificationTime"] == os.path.getmtime(dataFile)
@@ -1251,11 +1798,19 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
         Saves the datacube to a HDF5 group
         """
         dataFile.attrs["version"] = Datacube.version
-        dataFile.attrs["meta"] = yaml.dump(self._meta)
-        dataFile.attrs["parameters"] = yaml.dump(self._parameters)
+        self._syncMeta()
+        dataFile.attrs["meta"] = _yamlDump(self._serializableMeta())
+        dataFile.attrs["parameters"] = _yamlDump(self._parameters)
 
         if len(self) > 0:
-            dataFile.create_dataset('table', data=self.table())
+            buf = self.table()        # column_stack already yields a contiguous buffer of the live rows
+            if buf.size > 0:
+                ds = dataFile.create_dataset('table', shape=buf.shape, dtype=buf.dtype,
+                                             chunks=True, compression='lzf')
+                ds.write_direct(buf)
+            else:
+                # h5py cannot chunk a zero-sized shape such as (rows, 0 columns)
+                dataFile.create_dataset('table', data=buf)
 
         childrenFile = dataFile.create_group("children")
 
@@ -1264,7 +1819,7 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
             cnt = 0
             for item in self._children:
                 childFile = childrenFile.create_group(str(cnt))
-                childFile.attrs["attributes"] = yaml.dump(item.attributes())
+                childFile.attrs["attributes"] = _yamlDump(item.attributes())
                 child = item.datacube()
                 child.saveToHdf5Object(childFile, verbose=verbose)
                 cnt += 1
@@ -1272,30 +1827,53 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
         self._unsaved = False
         return True
 
-    def saveTable(self, filename, delimiter="\t", header=None):
+    def saveTable(self, filename, delimiter="\t", header=None, format='txt'):
         """
-        Saves the data table to a given file
+        Saves the data table to a given file.
+        header may be a string written verbatim before the table, or a callable
+        invoked with the open file so large headers stream directly to it.
+        format='bin' writes the table as a raw numpy .npy blob instead of text
+        (no header support: the metadata lives in the .par sidecar), which is
+        read and written by numpy's C machinery at memory-copy speed.
         """
+        if format == 'bin':
+            from numpy import save as npsave
+            file = open(filename, "wb")
+            npsave(file, self.table())
+            file.close()
+            return
         file = open(filename, "w")
         if header is not None:
-            file.write(header)
+            if callable(header):
+                header(file)
+            else:
+                file.write(header)
         headers = ""        # fields (column names)
         for name in self.names():
             headers += name + "\t"
         headers = string.rstrip(headers) + "\n"
         file.write(headers)
-        s = self._table.shape
-        for i in range(0, min(s[0], self._meta["length"])):
-            line = ""
-            for j in range(0, len(self._meta["fieldNames"])):
-                numberstr = str(self._table[i, j])
-                if numberstr[0] == '(':
-                    numberstr = numberstr[1:-1]
-                line += numberstr
-                if j != len(self._meta["fieldNames"]) - 1:
-                    line += delimiter
-            line += "\n"
-            file.write(line)
+        from numpy import savetxt as npsavetxt
+        table = self.table()[:self._length]
+        kind = table.dtype.kind
+        if kind == 'c':
+            # format real/imag pairs directly to avoid the parentheses of str(complex)
+            fmt = delimiter.join(['%.18g%+.18gj'] * len(self._fieldNames))
+            npsavetxt(file, table.view(float64 if table.dtype == complex128 else float32), fmt=fmt)
+        elif kind in 'fiu':
+            npsavetxt(file, table, delimiter=delimiter, fmt='%.18g')
+        else:                           # booleans and other odd dtypes keep the per-cell formatting
+            for i in range(0, table.shape[0]):
+                line = ""
+                for j in range(0, len(self._fieldNames)):
+                    numberstr = str(table[i, j])
+                    if numberstr[0] == '(':
+                        numberstr = numberstr[1:-1]
+                    line += numberstr
+                    if j != len(self._fieldNames) - 1:
+                        line += delimiter
+                line += "\n"
+                file.write(line)
         file.close()
 
     def savetxt(self, path=None, saveChildren=True, overwrite=False, forceSave=False, newFile=True, header=False, folders=False):
@@ -1330,7 +1908,7 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
         filename = self._sanitizeFilename(filename)
         basename = filename
         if not overwrite:
-            if os.path.exists(directory + "/" + basename + ".txt"):
+            if os.path.exists(os.path.join(directory, basename + ".txt")):
                 if newFile:
                     spl = basename.split('_')
                     if not ('_' in basename and spl[-1].isdigit()):  # basename ends by _x with x an integer
@@ -1340,15 +1918,15 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
                     while True:
                         spl[-1] = str(cnt)
                         basename = '_'.join(spl)
-                        if not os.path.exists(directory + "/" + basename + ".txt"):
+                        if not os.path.exists(os.path.join(directory, basename + ".txt")):
                             break
                         cnt += 1
                 else:
                     print "FILE(s) NOT SAVED: Not allowed to overwrite existing files or create new ones => Modify overwrite and/or newFile keyword arguments."
                     return
         savename = basename + ".txt"
-        savepath = directory + "/" + savename
-        parpath = directory + "/" + basename + ".par"
+        savepath = os.path.join(directory, savename)
+        parpath = os.path.join(directory, basename + ".par")
 
         self.debugPrint("directory = ", directory, ' - name = ', basename)
 
@@ -1356,10 +1934,10 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
         le = len(self._children)
         direc = directory
         if folders and le != 0:
-            direc += '/' + basename + '-children'
+            direc = os.path.join(direc, basename + '-children')
             if not os.path.isdir(direc):
                 os.mkdir(direc)
-        children = []
+        tasks = []
         for i in range(0, le):
             item = self._children[i]
             child = item.datacube()
@@ -1372,17 +1950,46 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
                 childfilename = basename + "-" + childfilename
 
             self.debugPrint('calling recursively savetxt for child', childfilename)
-            childPath = child.savetxt(direc + "/" + childfilename, saveChildren=saveChildren,
-                                      overwrite=overwrite, newFile=newFile, forceSave=forceSave, header=header, folders=folders)
+            tasks.append((item, child, os.path.join(direc, childfilename)))
+
+        def saveChild(task):
+            return task[1].savetxt(task[2], saveChildren=saveChildren, overwrite=overwrite,
+                                   newFile=newFile, forceSave=forceSave, header=header, folders=folders)
+
+        # overlap the children file writes on a thread pool; the collision-avoidance
+        # logic above requires distinct target names, so identical names stay sequential
+        if le > 1 and len(set([task[2] for task in tasks])) == le:
+            from multiprocessing.pool import ThreadPool
+            pool = ThreadPool(min(le, 8))
+            try:
+                childPaths = pool.map(saveChild, tasks)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            childPaths = [saveChild(task) for task in tasks]
+        children = []
+        for (item, child, childTarget), childPath in zip(tasks, childPaths):
             if folders:
                 childPath = basename + '-children' + '/' + childPath
             children.append({'attributes': item.attributes(), 'path': childPath})
 
+        import errno
+
+        def statOrNone(path):    # one stat syscall instead of separate exists + getmtime calls
+            try:
+                return os.stat(path)
+            except OSError as error:
+                if error.errno != errno.ENOENT:
+                    raise
+                return None
+        saveStat = statOrNone(savepath)
+        parStat = statOrNone(parpath)
         save = True
-        if os.path.exists(savepath) and (os.path.exists(parpath) or header):
+        if saveStat is not None and (parStat is not None or header):
             self.debugPrint('unsaved, par file, txt file and cube modification times =', self._unsaved,
-                            ' ,  ', os.path.getmtime(savepath), ' , ', float(self._meta["modificationTime"]))
-            #save= self._unsaved or (os.path.getmtime(parpath)+0.1 < float(self._meta["modificationTime"])) or (os.path.getmtime(savepath)+0.1 < float(self._meta["modificationTime"]))
+                            ' ,  ', saveStat.st_mtime, ' , ', float(self._meta["modificationTime"]))
+            #save= self._unsaved or (parStat.st_mtime+0.1 < float(self._meta["modificationTime"])) or (saveStat.st_mtime+0.1 < float(self._meta["modificationTime"]))
             save = self._unsaved
         self.debugPrint('file either does not exist or is old = ', save)
 
@@ -1395,28 +2002,41 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
                 self.setFilename(savepath)
             else:
                 self.setFilename(parpath)
+            # undo the modificationTime bump of setFilename right away, so that the
+            # header fingerprint below is stable across unchanged resaves
+            self._meta["modificationTime"] = lastModif
 
             paramsDict = dict()
             paramsDict['version'] = Datacube.version
-            paramsDict['meta'] = copy.copy(self._meta)
+            self._syncMeta()
+            paramsDict['meta'] = self._serializableMeta()      # dtypes as names so the safe dumper accepts them
             paramsDict['parameters'] = self.parameters()
             paramsDict['children'] = children
             paramsDict['tablefilename'] = savename
 
-            paramstxt = yaml.dump(paramsDict)  # the dictionary is serialized using YAML
+            import hashlib
+            parhash = hashlib.md5(repr(paramsDict)).digest()   # fingerprint of the header content
 
             if not header:
-                params = open(parpath, "w")  # save the .par file
-                params.write(paramstxt)
-                params.close()
-                self.debugPrint(parpath, ' saved')
+                if parhash != self._parhash or parStat is None:
+                    # json when faithful, yaml otherwise (see _dumpParams);
+                    # an unchanged header is neither re-emitted nor re-written
+                    paramstxt = _dumpParams(paramsDict)
+                    params = open(parpath, "wb", 1 << 20)  # save the .par file in one buffered write
+                    params.write(paramstxt)
+                    params.close()
+                    self._parhash = parhash
+                    self.debugPrint(parpath, ' saved')
                 head = None
             else:
-                paramstxt += '#end of header\n'
-                head = paramstxt
+                paramstxt = _yamlDump(paramsDict)
+                self._parhash = parhash
+
+                def head(fh):     # stream the header straight to the table file, no concatenated copy
+                    fh.write(paramstxt)
+                    fh.write('#end of header\n')
             self.saveTable(savepath, header=head)
 
-            self._meta["modificationTime"] = lastModif
             self._unsaved = False
 
         return basename
@@ -1425,15 +2045,26 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
         """
         Erase a datacube from HardDrive
         """
-        filename = self.filename()
+        import errno
+        filenames = []
+        self._collectFilenames(filenames)
+        for path in filenames:
+            try:
+                os.unlink(path)
+            except OSError as error:
+                if error.errno != errno.ENOENT:    # a file already gone is not an error
+                    raise
 
-        for i in range(len(self._children) - 1, -1, -1):
-            self._children[i].datacube().erase()
-        try:
-            os.remove(filename)
-            os.remove(filename[:-3] + 'txt')
-        except:
-            raise
+    def _collectFilenames(self, acc):
+        """
+        Appends the files of the datacube and of all its descendants to acc (deepest last).
+        """
+        filename = self.filename()
+        if filename is not None:
+            acc.append(filename)
+            acc.append(os.path.splitext(filename)[0] + '.txt')
+        for item in self._children:
+            item.datacube()._collectFilenames(acc)
 
     def childrenAt(self, row):
         """
@@ -1446,32 +2077,90 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
         Used to clean up the filename and remove all unwanted characters
         """
         #filename = re.sub(r'\.', 'p', filename)
-        filename = re.sub(r'[^\=\_\-\+\w\d\[\]\(\)\s\\\/]', '-', filename)
-        return filename
+        return self._SANITIZE_RE.sub('-', filename)
 
     def save(self, filename, format='pickle'):
         """
         Dumps the datacube to a pickled string
         """
-        self._resize((self._meta["length"], len(self._meta["fieldNames"])))
+        try:
+            import cPickle as pickle
+        except ImportError:
+            import pickle
+        self._resize(self._length)
+        self._syncMeta()
         f = open(filename, "wb")
-        return pickle.dump(self, f)
+        try:
+            # the highest protocol stores the numpy buffers in binary instead of protocol 0 text
+            return pickle.dump(self, f, pickle.HIGHEST_PROTOCOL)
+        finally:
+            f.close()
+
+    def _migrateLoadedState(self):
+        """
+        Upgrades a __dict__ restored from a pickle written before the per-column
+        layout: splits the legacy 2D _table into 1D columns, mirrors the hot
+        meta entries and default-initializes the attributes added since.
+        """
+        if "_columns" in self.__dict__:
+            return
+        state = self.__dict__
+        self._debug = state.get("_debug", False)
+        self._length = 0                  # defaults overridden by _loadMetaAttrs below
+        self._fieldNames = []
+        self._dataType = float64
+        self._loadMetaAttrs()
+        self._meta.setdefault("fieldDtypes", dict())
+        table = state.pop("_table", None)
+        self._columns = dict()
+        self._capacity = 0
+        if table is not None and table.size > 0:
+            self._columns = dict([(name, ascontiguousarray(table[:, i]))
+                                  for i, name in enumerate(self._fieldNames)])
+            self._capacity = table.shape[0]
+        self._schemaDirty = True          # reconcile columns and maps with the loaded meta
+        self._adjustTable(reserve=0, notifyFields=False)
+        self._nextNewId = 1
+        self._batchDepth = 0
+        self._pendingNotify = OrderedDict()
+        self._childrenCache = None
+        self._childAttrIndex = dict()
+        self._childPool = []
+        self._parhash = None
+        for item in self._children:       # rebuild the attribute index of the restored children
+            for key, value in item.attributes().items():
+                self._indexChildAttribute(item, key, value)
 
     def load(self, filename):
         """
         Loads the datacube from a pickled file
         """
+        try:
+            import cPickle as pickle
+        except ImportError:
+            import pickle
         f = open(filename, "rb")
-        loaded = pickle.load(f)
+        try:
+            loaded = pickle.load(f)
+        finally:
+            f.close()
         self.__dict__ = loaded.__dict__
+        self._migrateLoadedState()
+        self._rebuildChildIndex()
 
     def loadstr(self, string):
         """
         loadstr(string)
         Load the datacube from a pickled string
         """
+        try:
+            import cPickle as pickle
+        except ImportError:
+            import pickle
         loaded = pickle.loads(string)
         self.__dict__ = loaded.__dict__
+        self._migrateLoadedState()
+        self._rebuildChildIndex()
 
     def loadtxt(self, path, format='yaml', loadChildren=True):
         """
@@ -1481,17 +2170,27 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
         filename = os.path.split(path)[1]
         directory = os.path.abspath(os.path.dirname(path))
         if os.path.exists(path + ".par"):       # try first to load parameters from filename.par
-            params = open(path + ".par", "r")
-            data = yaml.load(params.read())
+            # binary mode hands the raw bytes straight to the libyaml loader
+            params = open(path + ".par", "rb")
+            raw = params.read()
             params.close()
-            self.setFilename(directory + "/" + filename + ".par")
+            # a header written as json (a yaml subset) parses several times faster through the C json parser
+            if raw.lstrip()[:1] == '{':
+                import json
+                try:
+                    data = json.loads(raw)
+                except ValueError:
+                    data = _yamlLoad(raw)
+            else:
+                data = _yamlLoad(raw)
+            self.setFilename(os.path.join(directory, filename + ".par"))
         elif os.path.exists(path + ".txt"):     # and then from the header in filename.txt (if filename.par not found)
-            file = open(path + ".txt", "r")
+            file = open(path + ".txt", "rb")
             content = file.read()
             file.close()
             # retrieve the yaml by cutting just before the '/n#end of header/n'.
-            data = yaml.load(content.split('#end of header\n')[0])
-            self.setFilename(directory + "/" + filename + ".txt")
+            data = _yamlLoad(content.split('#end of header\n')[0])
+            self.setFilename(os.path.join(directory, filename + ".txt"))
 
         if "version" in data:
             version = data["version"]
@@ -1501,7 +2200,7 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
         guessStructure = False
 
         if version in ["0.1", "0.2", "0.3", "0.4"]:
-            self._meta = data["meta"]
+            self._meta = _restoreMetaDtypes(data["meta"])
             self._parameters = data["parameters"]
         elif version == "undefined":
             print "Undefined version, trying my best to load the datacube..."
@@ -1510,11 +2209,15 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
             for key in mapping.keys():
                 if key in data:
                     self._meta[mapping[key]] = data[key]
+        self._loadMetaAttrs()
 
         if "parameters" in data:
             self._parameters = data["parameters"]
 
         self._children = []
+        self._childrenCache = None
+        self._childIndex = dict()
+        self._childAttrIndex = dict()
 
         if loadChildren:
             if version == "undefined" or version == "0.1":
@@ -1522,12 +2225,15 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
                     try:
                         for path in data["children"][key]:
                             if not os.path.isabs(path):
-                                path = directory + "/" + path
+                                path = os.path.join(directory, path)
                             datacube = Datacube()
                             datacube.loadtxt(path)
                             attributes = {"row": key}
                             item = ChildItem(datacube, attributes)
                         self._children.append(item)
+                        self._childIndex[id(datacube)] = item
+                        self._indexChildAttribute(item, "row", key)
+                        self._childrenCache = None
                     except:
                         self.removeChild(datacube)
                         print "cannot load 1 datacube"
@@ -1537,14 +2243,14 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
                         datacube = Datacube()
                         path = child["path"]
                         if not os.path.isabs(path):
-                            path = directory + "/" + path
+                            path = os.path.join(directory, path)
                         datacube.loadtxt(path)
                         self.addChild(datacube, **child["attributes"])
                     except:
                         self.removeChild(datacube)
                         print "cannot load 1 datacube"
 
-        tableFilename = directory + "/" + data['tablefilename']
+        tableFilename = os.path.join(directory, data['tablefilename'])
 
         self.loadTable(tableFilename, guessStructure=guessStructure)
         self._unsaved = False
@@ -1582,9 +2288,9 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
         if not color in colors:
             colors.insert(0, color)
 
-        length = self._meta["length"]
-        names = self._meta["fieldNames"]
-        type = self._meta["dataType"]
+        length = self._length
+        names = self._fieldNames
+        type = self._dataType
 
         # give up if no possible plot
         giveup = type not in numberTypes and type not in complexTypes or length == 0
@@ -1593,17 +2299,17 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
             return
         # filter the x and y names
 
+        nameSet = set(names)
+
         def filter(t):
             if t and isinstance(t, basestring):
-                if t in names:
+                if t in nameSet:
                     t = [t]                  # replace a string that is not an existing name by None
                 else:
                     t = None
                     print "Warning from Datacube.plot():',t,' is not a valid column name"
-            elif t and isinstance(t, list):         # remove all non existing names from a list
-                for ti in t:
-                    if ti not in names:
-                        t.remove(ti)
+            elif t and isinstance(t, list):         # keep only the existing names of the list
+                t = [ti for ti in t if ti in nameSet]
                 if len(t) == 0:
                     t = None                              # None if empty list
                     print "Warning from Datacube.plot():',t,' is not a list with valid column names"
@@ -1642,20 +2348,15 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
             plots.append([x[i % lx], y[i % ly]])
         #% function to build columns
 
-        def colFunc(name, l):
+        columns = self._columns
+
+        def colFunc(name):
             if name == 'row index':
-                return range(l)
-            else:
-                return self.column(name)
+                return arange(length)
+            return columns[name][:length]    # shared view on the stored column, no copy
 
         def colsFunc(namesB):
-            name1, name2 = namesB
-            l = 0
-            if name1 == 'row index':
-                l = len(self.column(name1))
-            elif name2 == 'row index':
-                l = len(self.column(name2))
-            return [colFunc(name1, l), colFunc(name2, l)]
+            return [colFunc(namesB[0]), colFunc(namesB[1])]
         self.debugPrint('plots = ', plots)
         # build figure
         if not fig:
@@ -1680,9 +2381,9 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
                 xLabel += xName
                 yLabel += yName
             else:
-                xCol = xCol.real()
-                plt.plot(xCol, yCol.real(), linestyle='-', marker=marker, color=colori, label=yName + '(' + xName + ')')
-                plt.plot(xCol, yCol.imag(), linestyle='--', marker=marker, color=colori)
+                xCol = xCol.real          # .real/.imag are zero-copy ndarray views, not method calls
+                plt.plot(xCol, yCol.real, linestyle='-', marker=marker, color=colori, label=yName + '(' + xName + ')')
+                plt.plot(xCol, yCol.imag, linestyle='--', marker=marker, color=colori)
                 xLabel += 'Re(' + xName + ')'
                 yLabel += 'Re(' + yName + '),Im(' + yName + ')'
             colorIndex = (colorIndex + 1) % len(colors)
@@ -1733,7 +2434,7 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
                 self._parameters["defaultPlot"].append(listOfVariableNames)
         else:
             self._parameters["defaultPlot"] = [listOfVariableNames]
-        self.notify('names', self._meta['fieldNames'])
+        self.notify('names', self._fieldNames)
 
     #*******************************************************************************
     # Methods to flatten datacube's children to a single datacube
@@ -1746,52 +2447,58 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
         """
         flatCube = Datacube(self.name() + '_Flat')
         parentNames = self.names()
+        offset = 0
         for i, child in enumerate(self.children()):
             row = self.attributesOfChild(child)['row']
-            d, order = {'row': row}, ['row'] + parentNames
-            parentValues = self.rowAt(i)
-            d.update({key: val for key, val in zip(parentNames, parentValues)})
+            nbrRows = len(child)
+            if nbrRows == 0:
+                continue
             childNames = child.names()
-            order += childNames
-            for j in range(len(child)):
-                d.update({key: val for key, val in zip(childNames, child.rowAt(j))})
-                flatCube.set(columnOrder=order, commit=True, **d)
+            order = ['row'] + parentNames + childNames
+            # broadcast the repeated parent row and copy each child column in one block
+            values = {'row': full(nbrRows, row)}
+            for key, val in zip(parentNames, self.rowAt(i)):
+                values[key] = full(nbrRows, val)
+            for key in childNames:
+                values[key] = child.column(key)
+            flatCube.setColumns(offsetRow=offset, columnOrder=order, **values)
+            offset += nbrRows
         return flatCube
 
     #*******************************************************************************
-    # Methods to interact with Igor software
+    # Methods to export the datacube to other column-oriented containers
     #*******************************************************************************
 
-    def sendToIgor(self, path="root:"):
+    def toPandas(self):
         """
+        Returns a pandas DataFrame built on the datacube's column views.
+        For numeric dtypes the DataFrame shares the column buffers with the datacube (no copy),
+        so downstream pandas operations run directly on the stored arrays;
+        writing to the DataFrame therefore also writes to the datacube.
         """
-        igorCom = IgorCommunicator()
-        igorCom._app.visible = 1
-        root = igorCom._app.DataFolder("root")
-        folderName = self.name()  # path+self.name()
-        while igorCom.dataFolderExists(path + folderName):
-            print "'" + path + folderName + "' already exists"
-            i += 1
-            folderName = self.name() + "-" + str(i)
-
-        igorCom.createDataFolder(path + "'" + folderName + "'")
+        import pandas
+        length = self._length
+        columns = self._columns
+        names = list(self._fieldNames)
+        return pandas.DataFrame(dict([(name, columns[name][:length]) for name in names]),
+                                columns=names, copy=False)
 
-        for column in self._meta["fieldNames"]:
-            igorCom("Make /N=%i/D/O %s'%s':'%s'" % (len(self[column]), path, folderName, column))
-            wave = root.Wave("%s'%s':%s" % (path, folderName, column))
-            for i in range(0, len(self[column])):
-                wave.SetNumericWavePointValue(i, self[column][i])
-        filenameVariable = "%s'%s':%s" % (path, folderName, "filename")
-        igorCom(["String %s" % filenameVariable])
-        if self.filename() is not None:
-            igorCom([filenameVariable + "=\"%s\"" % string.replace(self.filename(), "\\", ":")])
+    def toArrow(self):
+        """
+        Returns a pyarrow Table built from the datacube's column views.
+        Arrow wraps numpy buffers of primitive dtypes zero-copy, so no data is re-materialized.
+        """
+        import pyarrow
+        length = self._length
+        columns = self._columns
+        names = list(self._fieldNames)
+        return pyarrow.Table.from_arrays([pyarrow.array(columns[name][:length]) for name in names],
+                                         names=names)
 
-        for c in self.children():
-            c.sendToIgor(path=path + "'" + self.name() + "':")
+    #*******************************************************************************
+    # Methods to interact with Igor software
+    #*******************************************************************************
 
-        #cmd="Display %s vs %s"%("root:'"+folderName+"':'"+y+"'","root:'"+folderName+"':'"+x+"'")
-        # print cmd
-        # igorCom(cmd)
     def sendToIgor(self, path="root:"):
         """
         """
@@ -1806,11 +2513,16 @@ class Datacube(Subject, Observer, Reloadable, Debugger):
             folderName = self.name() + "-" + str(i)
         igorCom.createDataFolder(path + "'" + folderName + "'")
 
-        for column in self._meta["fieldNames"]:
-            igorCom("Make /N=%i/D/O %s'%s':'%s'" % (len(self[column]), path, folderName, column))
+        for column in self._fieldNames:
+            values = self[column]
+            igorCom("Make /N=%i/D/O %s'%s':'%s'" % (len(values), path, folderName, column))
             wave = root.Wave("%s'%s':%s" % (path, folderName, column))
-            for i in range(0, len(self[column])):
-                wave.SetNumericWavePointValue(i, self[column][i])
+            try:
+                # one COM call for the whole wave instead of one round trip per point
+                wave.SetNumericWaveData(values.tolist())
+            except:
+                for i in range(0, len(values)):
+                    wave.SetNumericWavePointValue(i, values[i])
         filenameVariable = "%s'%s':%s" % (path, folderName, "filename")
         igorCom(["String %s" % filenameVariable])
         if self.filename() is not None: